@@ -7,51 +7,57 @@ that will be applied when the PR is merged to the main branch.
 
 Used by: .github/workflows/version-check.yml  
 Purpose: Provide developers with preview of version impact before merging
-Dependencies: GitPython, subprocess
+Dependencies: subprocess (git command line), version_utils.py (shared helpers)
 """
 
-import git
 import subprocess
-import re
+from pathlib import Path
+from version_utils import find_version_span, parse_name_status
 
 
-def get_version_from_file():
-    """Read version directly from __about__.py"""
+_ABOUT_PATH = Path('backend/global_economy_sim/__about__.py')
+
+
+def _git(*args):
+    """Run a git plumbing command and return its output"""
+    return subprocess.check_output(['git', *args], text=True)
+
+
+def get_version_from_file(rev):
+    """Read version from __about__.py as committed at rev, without checking it out"""
     try:
-        with open('backend/global_economy_sim/__about__.py', 'r') as f:
-            content = f.read()
-            match = re.search(r'__version__\s*=\s*["\']([^"\']+)["\']', content)
-            if match:
-                return match.group(1)
-            return "0.1.0"  # fallback
-    except FileNotFoundError:
+        content = _git('show', f'{rev}:{_ABOUT_PATH.as_posix()}')
+        span = find_version_span(content)
+        if span:
+            return content[span[0]:span[1]]
         return "0.1.0"  # fallback
+    except subprocess.CalledProcessError:
+        return "0.1.0"  # fallback
+
+
+def get_changed_files(base, head):
+    """List (status, path) for each file changed on head since it forked from base"""
+    return parse_name_status(_git('diff', '--name-status', '-z', '-M', f'{base}...{head}'))
 
 
 def analyze_pr_impact():
     """Analyze PR changes and predict version bump"""
     try:
-        # Get base version from origin/main without checking out
-        repo = git.Repo('.')
-        
-        # Get base version by reading file content from main branch
-        main_commit = repo.commit('origin/main')
-        try:
-            # Read __about__.py from main branch
-            about_content = main_commit.tree['backend/global_economy_sim/__about__.py'].data_stream.read().decode('utf-8')
-            match = re.search(r'__version__\s*=\s*["\']([^"\']+)["\']', about_content)
-            base_version = match.group(1) if match else "0.1.0"
-        except (KeyError, AttributeError):
-            base_version = "0.1.0"
+        # Get base version by reading __about__.py from main branch without checking out
+        base_version = get_version_from_file('origin/main')
         
-        # Get current PR commit
-        pr_commit = repo.head.commit
-        changes = main_commit.diff(pr_commit)
+        # Get changes introduced by the current PR commit
+        changes = get_changed_files('origin/main', 'HEAD')
         
         total_files = len(changes)
-        python_files = len([c for c in changes if (c.a_path or c.b_path or '').endswith('.py')])
-        new_files = len([c for c in changes if c.change_type == 'A'])
-        deleted_files = len([c for c in changes if c.change_type == 'D'])
+        python_files = new_files = deleted_files = 0
+        for change_type, file_path in changes:
+            if file_path.endswith('.py'):
+                python_files += 1
+            if change_type == 'A':
+                new_files += 1
+            elif change_type == 'D':
+                deleted_files += 1
         
         # Simple heuristic for PR preview
         if deleted_files > 0 or total_files > 10:
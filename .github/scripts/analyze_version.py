@@ -8,55 +8,101 @@ whether a MAJOR, MINOR, or PATCH version bump is appropriate.
 
 Used by: .github/workflows/version-check.yml
 Purpose: Maintain 100% automated versioning with zero developer intervention
-Dependencies: GitPython, packaging, subprocess
+Dependencies: GitPython, packaging, version_utils.py (shared helpers)
 """
 
+import collections
+import functools
 import os
 import re
 import sys
 import git
-import subprocess
-from packaging import version
+from pathlib import Path
+from version_utils import find_version_span, parse_name_status
 
 
-def run_cmd(cmd):
-    """Execute a shell command and return the result."""
-    try:
-        result = subprocess.check_output(cmd, shell=True, text=True, cwd='.').strip()
-        return result
-    except subprocess.CalledProcessError as e:
-        print(f"Command failed: {cmd}")
-        print(f"Error: {e}")
-        raise
+_ABOUT_PATH = Path('backend/global_economy_sim/__about__.py')
+_SEMVER_RE = re.compile(r'^(\d+)\.(\d+)\.(\d+)(?:(a|b|rc)(\d+))?$')
+_KNOWN_PRE_TYPES = frozenset({'a', 'b', 'rc'})
+
+# Keyword scans over the lines a patch adds (raw bytes, case-insensitive, no decoding)
+_MAJOR_RE = re.compile(
+    rb'(?:class|def|function)\s.*deleted|breaking change|deprecated|\bremoved\b'
+    rb'|incompatible|migration required',
+    re.IGNORECASE
+)
+_FEATURE_RE = re.compile(
+    rb'\b(?:def|class|function) |new.*feature|add.*method|implement',
+    re.IGNORECASE
+)
+
+# Commit-message stage commands, e.g. '[bump alpha]', grouped by the bump type they request
+_STAGE_COMMANDS = {
+    'graduate': ('[graduate from alpha]', '[alpha graduation]', '[graduate to stable]', '[alpha -> stable]'),
+    'alpha': ('[alpha increment]', '[bump alpha]', '[alpha bump]', '[increment alpha]'),
+    'beta': ('[beta increment]', '[bump beta]', '[beta bump]', '[increment beta]'),
+    'rc': ('[rc increment]', '[bump rc]', '[rc bump]', '[increment rc]', '[release candidate increment]'),
+    'promote-beta': ('[alpha to beta]', '[promote to beta]', '[beta stage]'),
+    'promote-rc': ('[beta to rc]', '[promote to rc]', '[release candidate stage]', '[rc stage]'),
+}
+# One named group per bump type ('-' is not allowed in group names, so it becomes '_')
+_STAGE_COMMAND_RE = re.compile(
+    '|'.join(
+        f"(?P<{bump_type.replace('-', '_')}>{'|'.join(map(re.escape, phrases))})"
+        for bump_type, phrases in _STAGE_COMMANDS.items()
+    ),
+    re.IGNORECASE
+)
+
+# Commit-message keywords, matched against whole words (inflected forms listed explicitly
+# so 'Fixed'/'bugs'/'Added' still count while words like 'prefix' or 'address' do not)
+_WORD_RE = re.compile(r'[a-z]+')
+_MAJOR_WORDS = frozenset({'break', 'breaks', 'breaking', 'major', 'incompatible'})
+_MINOR_WORDS = frozenset({
+    'feat', 'feats', 'feature', 'features',
+    'add', 'adds', 'added', 'adding',
+    'new',
+    'implement', 'implements', 'implemented', 'implementing', 'implementation',
+})
+_PATCH_WORDS = frozenset({
+    'fix', 'fixes', 'fixed', 'fixing',
+    'bug', 'bugs', 'bugfix', 'bugfixes',
+    'patch', 'patches', 'patched',
+    'hotfix', 'hotfixes',
+})
+
+# Paths per `git diff` call when rendering patches (keeps the command line well below ARG_MAX)
+_PATCH_BATCH_SIZE = 100
 
+# File categories by extension
+_CODE_EXTS = frozenset({'.py', '.js', '.ts', '.java', '.cpp', '.c'})
+_CONFIG_EXTS = frozenset({'.json', '.yaml', '.yml', '.toml', '.cfg', '.ini'})
+_DOC_EXTS = frozenset({'.md', '.rst', '.txt'})
 
+
+@functools.lru_cache(maxsize=1)
 def get_version_from_file():
-    """Read version directly from __about__.py"""
+    """Read (version, file content) from __about__.py (cached until update_version_file rewrites it)"""
     try:
-        with open('backend/global_economy_sim/__about__.py', 'r') as f:
-            content = f.read()
-            match = re.search(r'__version__\s*=\s*["\']([^"\']+)["\']', content)
-            if match:
-                return match.group(1)
-            return "0.1.0"  # fallback
+        content = _ABOUT_PATH.read_text()
+        span = find_version_span(content)
+        if span:
+            return content[span[0]:span[1]], content
+        return "0.1.0", content  # fallback
     except FileNotFoundError:
-        return "0.1.0"  # fallback
+        return "0.1.0", ""  # fallback
 
 
-def update_version_file(new_version):
-    """Update version directly in __about__.py"""
+def update_version_file(new_version, content):
+    """Update version in __about__.py, given the content already read by get_version_from_file"""
     try:
-        with open('backend/global_economy_sim/__about__.py', 'r') as f:
-            content = f.read()
-        
-        updated_content = re.sub(
-            r'(__version__\s*=\s*["\'])([^"\']+)(["\'])',
-            f'\\g<1>{new_version}\\g<3>',
-            content
-        )
+        span = find_version_span(content)
+        if not span:
+            raise ValueError(f"No __version__ assignment found in {_ABOUT_PATH}")
+        updated_content = content[:span[0]] + new_version + content[span[1]:]
         
-        with open('backend/global_economy_sim/__about__.py', 'w') as f:
-            f.write(updated_content)
+        _ABOUT_PATH.write_text(updated_content)
+        get_version_from_file.cache_clear()
         
         print(f"✅ Updated __about__.py with version {new_version}")
         return True
@@ -65,209 +111,272 @@ def update_version_file(new_version):
         return False
 
 
+_Version = collections.namedtuple('_Version', 'major minor micro pre')
+
+
+def parse_version(version_string):
+    """Split a version into its numeric parts and pre-release tuple (InvalidVersion if unparseable)"""
+    # Fast path for the 'X.Y.Z' / 'X.Y.Z{a|b|rc}N' shapes this project normally uses
+    match = _SEMVER_RE.match(version_string)
+    if match:
+        major, minor, micro, pre_type, pre_number = match.groups()
+        pre = (pre_type, int(pre_number)) if pre_type else None
+        return _Version(int(major), int(minor), int(micro), pre)
+    
+    # Anything else ('1.0', '0.1.0-alpha.1', '0.1.0dev1', ...) goes through PEP 440 parsing,
+    # imported here so the fast path never pays for it; a bare dev release is reported as
+    # the pre-release type 'dev'
+    from packaging import version
+    ver = version.parse(version_string)
+    if ver.pre:
+        pre = ver.pre
+    elif ver.dev is not None:
+        pre = ('dev', ver.dev)
+    else:
+        pre = None
+    return _Version(ver.major, ver.minor, ver.micro, pre)
+
+
+def _graduate(ver, current_version):
+    """Drop the pre-release suffix without incrementing"""
+    if ver.pre:
+        print(f"🎓 Graduating from {ver.pre[0]}{ver.pre[1]} to stable")
+        return f"{ver.major}.{ver.minor}.{ver.micro}"
+    print("⚠️  Cannot graduate non-pre-release version (already stable)")
+    return current_version
+
+
+def _increment_stage(stage, name, stage_desc, ver, current_version):
+    """Bump only the pre-release number, if the version is already in that stage"""
+    if ver.pre and ver.pre[0] == stage:
+        return f"{ver.major}.{ver.minor}.{ver.micro}{stage}{ver.pre[1] + 1}"
+    if ver.pre:
+        print(f"⚠️  {name} increment requested but current version is {ver.pre[0]}{ver.pre[1]}")
+        print(f"{name} increment only works on {stage_desc} versions")
+    else:
+        print(f"⚠️  {name} increment only works on {stage_desc} versions")
+    return current_version
+
+
+def _promote_beta(ver, current_version):
+    """Move an alpha version to beta stage"""
+    stage = ver.pre[0] if ver.pre else None
+    if stage == 'a':
+        return f"{ver.major}.{ver.minor}.{ver.micro}b0"
+    if stage == 'b':
+        print("⚠️  Already in beta stage, cannot promote to beta")
+    elif stage == 'rc':
+        print("⚠️  Cannot promote backwards from release candidate to beta")
+    elif stage:
+        print(f"⚠️  Cannot promote from unknown pre-release type '{stage}' to beta")
+        print("Beta promotion only works from alpha versions")
+    else:
+        print("⚠️  Beta promotion only works from alpha versions")
+    return current_version
+
+
+def _promote_rc(ver, current_version):
+    """Move a beta version to release candidate stage"""
+    stage = ver.pre[0] if ver.pre else None
+    if stage == 'b':
+        return f"{ver.major}.{ver.minor}.{ver.micro}rc0"
+    if stage == 'a':
+        print("⚠️  Cannot skip beta stage - promote to beta first")
+    elif stage == 'rc':
+        print("⚠️  Already in release candidate stage, cannot promote to RC")
+    elif stage:
+        print(f"⚠️  Cannot promote from unknown pre-release type '{stage}' to release candidate")
+        print("RC promotion only works from beta versions")
+    else:
+        print("⚠️  RC promotion only works from beta versions")
+    return current_version
+
+
+def _bump_base(new_base, ver):
+    """Attach the current pre-release suffix (if any) to a new base version"""
+    if ver.pre:
+        if ver.pre[0] not in _KNOWN_PRE_TYPES:
+            # Handle unknown pre-release types safely
+            print(f"⚠️  Unknown pre-release type '{ver.pre[0]}' detected")
+            print(f"Preserving original pre-release identifier: {ver.pre[0]}{ver.pre[1]}")
+        return f"{new_base}{ver.pre[0]}{ver.pre[1]}"
+    return new_base
+
+
+def _bump_major(ver, current_version):
+    """X.Y.Z -> (X+1).0.0, keeping any pre-release suffix"""
+    return _bump_base(f"{ver.major + 1}.0.0", ver)
+
+
+def _bump_minor(ver, current_version):
+    """X.Y.Z -> X.(Y+1).0, keeping any pre-release suffix"""
+    return _bump_base(f"{ver.major}.{ver.minor + 1}.0", ver)
+
+
+def _bump_patch(ver, current_version):
+    """X.Y.Z -> X.Y.(Z+1), keeping any pre-release suffix"""
+    return _bump_base(f"{ver.major}.{ver.minor}.{ver.micro + 1}", ver)
+
+
+# Bump type -> handler(ver, current_version); anything unrecognised is treated as a patch
+_BUMPERS = {
+    "graduate": _graduate,
+    "alpha": functools.partial(_increment_stage, 'a', "Alpha", "alpha"),
+    "beta": functools.partial(_increment_stage, 'b', "Beta", "beta"),
+    "rc": functools.partial(_increment_stage, 'rc', "RC", "release candidate"),
+    "promote-beta": _promote_beta,
+    "promote-rc": _promote_rc,
+    "major": _bump_major,
+    "minor": _bump_minor,
+    "patch": _bump_patch,
+}
+
+
 def increment_version(current_version, bump_type):
     """Increment version based on bump type, preserving pre-release status"""
     try:
-        ver = version.parse(current_version)
-        
-        # Check if current version is a pre-release (alpha, beta, rc)
-        is_prerelease = ver.is_prerelease
-        prerelease_type = None
-        prerelease_number = 0
-        
-        if is_prerelease:
-            # Extract pre-release info (e.g., 'a0', 'b1', 'rc2')
-            if ver.pre:
-                prerelease_type = ver.pre[0]  # 'a', 'b', 'rc'
-                prerelease_number = ver.pre[1]  # 0, 1, 2, etc.
-            
-            print(f"🔍 Detected pre-release version: {current_version} (type: {prerelease_type}, number: {prerelease_number})")
+        ver = parse_version(current_version)
+        if ver.pre:
+            print(f"🔍 Detected pre-release version: {current_version} (type: {ver.pre[0]}, number: {ver.pre[1]})")
             
             # Log unknown pre-release types for awareness
-            if prerelease_type not in ['a', 'b', 'rc']:
-                print(f"ℹ️  Note: Unknown pre-release type '{prerelease_type}' detected")
+            if ver.pre[0] not in _KNOWN_PRE_TYPES:
+                print(f"ℹ️  Note: Unknown pre-release type '{ver.pre[0]}' detected")
                 print(f"Supported types: 'a' (alpha), 'b' (beta), 'rc' (release candidate)")
                 print(f"Will preserve original identifier during semantic version bumps")
         
-        # Handle graduation from pre-release to stable
-        if bump_type == "graduate":
-            if is_prerelease:
-                # Graduate to stable version without incrementing
-                print(f"🎓 Graduating from {prerelease_type}{prerelease_number} to stable")
-                return f"{ver.major}.{ver.minor}.{ver.micro}"
-            else:
-                print("⚠️  Cannot graduate non-pre-release version (already stable)")
-                return current_version
-        
-        # Handle alpha increment (only bump the alpha number)
-        if bump_type == "alpha":
-            if is_prerelease and prerelease_type == 'a':
-                # Increment only the alpha number
-                return f"{ver.major}.{ver.minor}.{ver.micro}a{prerelease_number + 1}"
-            elif is_prerelease and prerelease_type:
-                print(f"⚠️  Alpha increment requested but current version is {prerelease_type}{prerelease_number}")
-                print("Alpha increment only works on alpha versions")
-                return current_version
-            else:
-                print("⚠️  Alpha increment only works on alpha versions")
-                return current_version
-        
-        # Handle beta increment (only bump the beta number)
-        if bump_type == "beta":
-            if is_prerelease and prerelease_type == 'b':
-                # Increment only the beta number
-                return f"{ver.major}.{ver.minor}.{ver.micro}b{prerelease_number + 1}"
-            elif is_prerelease and prerelease_type:
-                print(f"⚠️  Beta increment requested but current version is {prerelease_type}{prerelease_number}")
-                print("Beta increment only works on beta versions")
-                return current_version
-            else:
-                print("⚠️  Beta increment only works on beta versions")
-                return current_version
-        
-        # Handle release candidate increment (only bump the rc number)
-        if bump_type == "rc":
-            if is_prerelease and prerelease_type == 'rc':
-                # Increment only the rc number
-                return f"{ver.major}.{ver.minor}.{ver.micro}rc{prerelease_number + 1}"
-            elif is_prerelease and prerelease_type:
-                print(f"⚠️  RC increment requested but current version is {prerelease_type}{prerelease_number}")
-                print("RC increment only works on release candidate versions")
-                return current_version
-            else:
-                print("⚠️  RC increment only works on release candidate versions")
-                return current_version
-        
-        # Handle promotion from alpha to beta
-        if bump_type == "promote-beta":
-            if is_prerelease and prerelease_type == 'a':
-                # Promote to beta stage
-                return f"{ver.major}.{ver.minor}.{ver.micro}b0"
-            elif is_prerelease and prerelease_type == 'b':
-                print("⚠️  Already in beta stage, cannot promote to beta")
-                return current_version
-            elif is_prerelease and prerelease_type == 'rc':
-                print("⚠️  Cannot promote backwards from release candidate to beta")
-                return current_version
-            elif is_prerelease and prerelease_type:
-                print(f"⚠️  Cannot promote from unknown pre-release type '{prerelease_type}' to beta")
-                print("Beta promotion only works from alpha versions")
-                return current_version
-            else:
-                print("⚠️  Beta promotion only works from alpha versions")
-                return current_version
-        
-        # Handle promotion from beta to release candidate
-        if bump_type == "promote-rc":
-            if is_prerelease and prerelease_type == 'b':
-                # Promote to release candidate stage
-                return f"{ver.major}.{ver.minor}.{ver.micro}rc0"
-            elif is_prerelease and prerelease_type == 'a':
-                print("⚠️  Cannot skip beta stage - promote to beta first")
-                return current_version
-            elif is_prerelease and prerelease_type == 'rc':
-                print("⚠️  Already in release candidate stage, cannot promote to RC")
-                return current_version
-            elif is_prerelease and prerelease_type:
-                print(f"⚠️  Cannot promote from unknown pre-release type '{prerelease_type}' to release candidate")
-                print("RC promotion only works from beta versions")
-                return current_version
-            else:
-                print("⚠️  RC promotion only works from beta versions")
-                return current_version
-        
-        # Increment version while preserving pre-release status
-        if bump_type == "major":
-            new_base = f"{ver.major + 1}.0.0"
-        elif bump_type == "minor":
-            new_base = f"{ver.major}.{ver.minor + 1}.0"
-        else:  # patch
-            new_base = f"{ver.major}.{ver.minor}.{ver.micro + 1}"
-        
-        # If original was pre-release, keep it as pre-release
-        if is_prerelease and prerelease_type:
-            if prerelease_type == 'a':
-                return f"{new_base}a{prerelease_number}"
-            elif prerelease_type == 'b':
-                return f"{new_base}b{prerelease_number}"
-            elif prerelease_type == 'rc':
-                return f"{new_base}rc{prerelease_number}"
-            else:
-                # Handle unknown pre-release types safely
-                print(f"⚠️  Unknown pre-release type '{prerelease_type}' detected")
-                print(f"Preserving original pre-release identifier: {prerelease_type}{prerelease_number}")
-                return f"{new_base}{prerelease_type}{prerelease_number}"
-        else:
-            return new_base
-            
+        return _BUMPERS.get(bump_type, _bump_patch)(ver, current_version)
     except Exception as e:
         print(f"❌ Error incrementing version: {e}")
         return current_version
 
 
-def analyze_changes():
-    """Analyze git changes to determine version bump type"""
+def get_changed_files(repo, base, head):
+    """List (status, path) for each file changed between two commits using git diff --name-status"""
+    return parse_name_status(repo.git.diff('--name-status', '-z', '-M', base.hexsha, head.hexsha))
+
+
+def get_line_counts(repo, base, head):
+    """Map each changed path to its (additions, deletions) using git diff --numstat"""
+    line_counts = {}
+    fields = iter(repo.git.diff('--numstat', '-z', '-M', base.hexsha, head.hexsha).split('\0'))
+    for field in fields:
+        if not field:
+            continue
+        additions, deletions, path = field.split('\t', 2)
+        # Binary files report '-' instead of line counts
+        counts = (
+            int(additions) if additions.isdigit() else 0,
+            int(deletions) if deletions.isdigit() else 0
+        )
+        if path:
+            line_counts[path] = counts
+        else:
+            # Renames list the old and new paths as the next two fields
+            line_counts[next(fields)] = counts
+            line_counts[next(fields)] = counts
+    return line_counts
+
+
+def added_lines(patch):
+    """Join the lines a patch adds, so keyword scans ignore context and removed lines"""
+    added = []
+    in_hunk = False
+    for line in patch.splitlines():
+        # Any '---'/'+++' file headers come before the first hunk; inside a hunk every
+        # line carries a ' '/'+'/'-' prefix, so added lines that start with '++' are kept
+        if line.startswith(b'@@'):
+            in_hunk = True
+        elif in_hunk and line.startswith(b'+'):
+            added.append(line[1:])
+    return b'\n'.join(added)
+
+
+def iter_patch_batches(parent, commit, paths, batch_size=_PATCH_BATCH_SIZE):
+    """Yield {path: added lines} for paths, rendering at most batch_size patches per git call"""
+    for start in range(0, len(paths), batch_size):
+        batch = paths[start:start + batch_size]
+        yield {diff.b_path: added_lines(diff.diff) for diff in parent.diff(commit, batch, create_patch=True)}
+
+
+def format_indicator(indicator):
+    """Render an indicator tuple (template, subject, count) as a readable reason"""
+    template, subject, count = indicator
+    return template.format(subject=subject, count=count)
+
+
+def analyze_changes(repo, last_commit):
+    """Analyze the changes in last_commit (the pushed commit) to determine version bump type"""
     try:
-        # Get the last commit (since this runs on push to main)
-        repo = git.Repo('.')
-        
         # Get changes in the last commit
-        last_commit = repo.head.commit
         if not last_commit.parents:
             print("ℹ️  Initial commit detected")
             return "patch", "Initial commit"
         
         # Check commit message for graduation indicators
-        commit_msg = last_commit.message.lower()
-        if any(phrase in commit_msg for phrase in ['[graduate from alpha]', '[alpha graduation]', '[graduate to stable]', '[alpha -> stable]']):
+        # Collect every stage command in the message with a single scan
+        commit_msg = last_commit.message
+        commands = {match.lastgroup.replace('_', '-') for match in _STAGE_COMMAND_RE.finditer(commit_msg)}
+        if 'graduate' in commands:
             print("🎓 Alpha graduation detected in commit message")
             return "graduate", "Alpha graduation indicated in commit message"
         
         # Check for potential backward progression attempts and warn
-        current_version = get_version_from_file()
-        current_ver = version.parse(current_version)
-        if current_ver.is_prerelease and current_ver.pre:
+        current_version, _ = get_version_from_file()
+        current_ver = parse_version(current_version)
+        if current_ver.pre:
             current_stage = current_ver.pre[0]
             
             # Detect attempts to go backwards
-            if current_stage == 'b' and any(phrase in commit_msg for phrase in ['[alpha increment]', '[bump alpha]', '[alpha bump]', '[increment alpha]']):
+            if current_stage == 'b' and 'alpha' in commands:
                 print("🚨 WARNING: Attempt to use alpha commands on beta version detected!")
                 print(f"Current version is {current_version} (beta stage)")
                 print("Ignoring alpha command and proceeding with automatic analysis...")
-            elif current_stage == 'rc' and any(phrase in commit_msg for phrase in ['[alpha increment]', '[bump alpha]', '[alpha bump]', '[increment alpha]', '[beta increment]', '[bump beta]', '[beta bump]', '[increment beta]']):
+            elif current_stage == 'rc' and ('alpha' in commands or 'beta' in commands):
                 print("🚨 WARNING: Attempt to use alpha/beta commands on release candidate version detected!")
                 print(f"Current version is {current_version} (release candidate stage)")
                 print("Ignoring backward stage command and proceeding with automatic analysis...")
-            elif current_stage == 'rc' and any(phrase in commit_msg for phrase in ['[alpha to beta]', '[promote to beta]', '[beta stage]']):
+            elif current_stage == 'rc' and 'promote-beta' in commands:
                 print("🚨 WARNING: Attempt to promote to beta from release candidate detected!")
                 print(f"Current version is {current_version} (already past beta stage)")
                 print("Ignoring backward promotion and proceeding with automatic analysis...")
         
         # Check for alpha increment indicators (minor changes that should only bump alpha number)
-        if any(phrase in commit_msg for phrase in ['[alpha increment]', '[bump alpha]', '[alpha bump]', '[increment alpha]']):
+        if 'alpha' in commands:
             print("🔢 Alpha increment detected in commit message")
             return "alpha", "Alpha increment indicated in commit message"
         
         # Check for beta increment indicators
-        if any(phrase in commit_msg for phrase in ['[beta increment]', '[bump beta]', '[beta bump]', '[increment beta]']):
+        if 'beta' in commands:
             print("🔢 Beta increment detected in commit message")
             return "beta", "Beta increment indicated in commit message"
         
         # Check for release candidate increment indicators
-        if any(phrase in commit_msg for phrase in ['[rc increment]', '[bump rc]', '[rc bump]', '[increment rc]', '[release candidate increment]']):
+        if 'rc' in commands:
             print("🔢 Release candidate increment detected in commit message")
             return "rc", "Release candidate increment indicated in commit message"
         
         # Check for stage progression indicators
-        if any(phrase in commit_msg for phrase in ['[alpha to beta]', '[promote to beta]', '[beta stage]']):
+        if 'promote-beta' in commands:
             print("📈 Alpha to Beta promotion detected in commit message")
             return "promote-beta", "Promotion to beta stage indicated in commit message"
         
-        if any(phrase in commit_msg for phrase in ['[beta to rc]', '[promote to rc]', '[release candidate stage]', '[rc stage]']):
+        if 'promote-rc' in commands:
             print("📈 Beta to RC promotion detected in commit message")
             return "promote-rc", "Promotion to release candidate stage indicated in commit message"
         
-        changes = last_commit.diff(last_commit.parents[0])
+        parent = last_commit.parents[0]
+        changes = get_changed_files(repo, parent, last_commit)
+        line_counts = get_line_counts(repo, parent, last_commit)
+        
+        # Only modified code files need their patch text; render it a batch at a time as the
+        # loop reaches those files, so stopping at the first MAJOR also skips the later batches
+        modified_code_paths = [
+            file_path for change_type, file_path in changes
+            if change_type == 'M' and os.path.splitext(file_path)[1] in _CODE_EXTS
+        ]
+        patch_batches = iter_patch_batches(parent, last_commit, modified_code_paths)
+        patches = {}
         
         major_indicators = []
         minor_indicators = []
@@ -275,109 +384,106 @@ def analyze_changes():
         
         print("🔍 Analyzing code changes...")
         
-        for change in changes:
-            file_path = change.a_path or change.b_path
-            if not file_path:
-                continue
-                
+        # The first MAJOR indicator decides the bump, so stop scanning as soon as one is found
+        for change_type, file_path in changes:
             print(f"  📁 Analyzing: {file_path}")
             
             # Skip version bumps from the bot itself
-            if file_path == 'backend/global_economy_sim/__about__.py':
+            if file_path == _ABOUT_PATH.as_posix():
                 continue
             
             # Check file types and change patterns
-            if file_path.endswith(('.py', '.js', '.ts', '.java', '.cpp', '.c')):
-                if change.change_type == 'D':
-                    major_indicators.append(f"Deleted core file: {file_path}")
-                elif change.change_type == 'A':
-                    if 'api' in file_path.lower() or 'interface' in file_path.lower():
-                        minor_indicators.append(f"New API/interface: {file_path}")
+            lower_path = file_path.lower()
+            ext = os.path.splitext(file_path)[1]
+            if ext in _CODE_EXTS:
+                if change_type == 'D':
+                    major_indicators.append(("Deleted core file: {subject}", file_path, None))
+                    break
+                elif change_type == 'A':
+                    if 'api' in lower_path or 'interface' in lower_path:
+                        minor_indicators.append(("New API/interface: {subject}", file_path, None))
                     else:
-                        minor_indicators.append(f"New file: {file_path}")
-                elif change.change_type == 'M':
+                        minor_indicators.append(("New file: {subject}", file_path, None))
+                elif change_type == 'M':
                     # Analyze the actual diff content
                     try:
-                        diff_text = str(change.diff)
-                        
+                        while file_path not in patches:
+                            patches.update(next(patch_batches))
+                        added_bytes = patches[file_path]
+
                         # Major change indicators
-                        if any(pattern in diff_text.lower() for pattern in [
-                            'class.*deleted', 'def.*deleted', 'function.*deleted',
-                            'breaking change', 'deprecated', 'removed',
-                            'incompatible', 'migration required'
-                        ]):
-                            major_indicators.append(f"Breaking change detected in {file_path}")
-                        
-                        # Count lines changed (approximate)
-                        additions = diff_text.count('+')
-                        deletions = diff_text.count('-')
+                        if _MAJOR_RE.search(added_bytes):
+                            major_indicators.append(("Breaking change detected in {subject}", file_path, None))
+                            break
+
+                        additions, deletions = line_counts.get(file_path, (0, 0))
                         total_changes = additions + deletions
                         
                         if total_changes > 100:
-                            if 'api' in file_path.lower() or 'core' in file_path.lower():
-                                major_indicators.append(f"Major refactoring in core file: {file_path} ({total_changes} changes)")
+                            if 'api' in lower_path or 'core' in lower_path:
+                                major_indicators.append(("Major refactoring in core file: {subject} ({count} changes)", file_path, total_changes))
+                                break
                             else:
-                                minor_indicators.append(f"Significant changes: {file_path} ({total_changes} changes)")
+                                minor_indicators.append(("Significant changes: {subject} ({count} changes)", file_path, total_changes))
                         elif total_changes > 20:
-                            minor_indicators.append(f"Medium changes: {file_path} ({total_changes} changes)")
+                            minor_indicators.append(("Medium changes: {subject} ({count} changes)", file_path, total_changes))
                         else:
-                            patch_indicators.append(f"Small fix: {file_path} ({total_changes} changes)")
+                            patch_indicators.append(("Small fix: {subject} ({count} changes)", file_path, total_changes))
                             
-                        # Feature indicators
-                        if any(pattern in diff_text.lower() for pattern in [
-                            'def ', 'class ', 'function ', 'new.*feature',
-                            'add.*method', 'implement'
-                        ]):
-                            minor_indicators.append(f"New functionality in {file_path}")
+                        # Feature indicators can only escalate to MINOR, so skip the
+                        # scan once a MINOR indicator has already been recorded
+                        if not minor_indicators and _FEATURE_RE.search(added_bytes):
+                            minor_indicators.append(("New functionality in {subject}", file_path, None))
                             
                     except Exception as e:
                         print(f"  ⚠️  Could not analyze diff for {file_path}: {e}")
-                        patch_indicators.append(f"Modified: {file_path}")
+                        patch_indicators.append(("Modified: {subject}", file_path, None))
             
             # Configuration changes
-            elif file_path.endswith(('.json', '.yaml', '.yml', '.toml', '.cfg', '.ini')):
+            elif ext in _CONFIG_EXTS:
                 if 'package.json' in file_path or 'pyproject.toml' in file_path:
-                    minor_indicators.append(f"Package configuration updated: {file_path}")
+                    minor_indicators.append(("Package configuration updated: {subject}", file_path, None))
                 else:
-                    patch_indicators.append(f"Config updated: {file_path}")
+                    patch_indicators.append(("Config updated: {subject}", file_path, None))
             
             # Documentation
-            elif file_path.endswith(('.md', '.rst', '.txt')):
-                patch_indicators.append(f"Documentation updated: {file_path}")
+            elif ext in _DOC_EXTS:
+                patch_indicators.append(("Documentation updated: {subject}", file_path, None))
             
             # Tests
-            elif 'test' in file_path.lower() or file_path.endswith('_test.py'):
-                patch_indicators.append(f"Tests updated: {file_path}")
+            elif 'test' in lower_path or file_path.endswith('_test.py'):
+                patch_indicators.append(("Tests updated: {subject}", file_path, None))
         
         # Analyze commit message for additional context
-        commit_msg = last_commit.message.lower()
-        if any(word in commit_msg for word in ['break', 'breaking', 'major', 'incompatible']):
-            major_indicators.append(f"Breaking change indicated in commit: {last_commit.message[:50]}...")
-        elif any(word in commit_msg for word in ['feat', 'feature', 'add', 'new', 'implement']):
-            minor_indicators.append(f"Feature indicated in commit: {last_commit.message[:50]}...")
-        elif any(word in commit_msg for word in ['fix', 'bug', 'patch', 'hotfix']):
-            patch_indicators.append(f"Fix indicated in commit: {last_commit.message[:50]}...")
+        if not major_indicators:
+            commit_words = set(_WORD_RE.findall(commit_msg.lower()))
+            if commit_words & _MAJOR_WORDS:
+                major_indicators.append(("Breaking change indicated in commit: {subject}...", last_commit.message[:50], None))
+            elif commit_words & _MINOR_WORDS:
+                minor_indicators.append(("Feature indicated in commit: {subject}...", last_commit.message[:50], None))
+            elif commit_words & _PATCH_WORDS:
+                patch_indicators.append(("Fix indicated in commit: {subject}...", last_commit.message[:50], None))
         
         print(f"\n📊 Analysis Results:")
         print(f"  🚨 Major indicators: {len(major_indicators)}")
         for indicator in major_indicators[:3]:  # Show first 3
-            print(f"    - {indicator}")
+            print(f"    - {format_indicator(indicator)}")
             
         print(f"  ✨ Minor indicators: {len(minor_indicators)}")
         for indicator in minor_indicators[:3]:
-            print(f"    - {indicator}")
+            print(f"    - {format_indicator(indicator)}")
             
         print(f"  🐛 Patch indicators: {len(patch_indicators)}")
         for indicator in patch_indicators[:3]:
-            print(f"    - {indicator}")
+            print(f"    - {format_indicator(indicator)}")
         
         # Decision logic
         if major_indicators:
-            return "major", major_indicators[0]
+            return "major", format_indicator(major_indicators[0])
         elif minor_indicators:
-            return "minor", minor_indicators[0]
+            return "minor", format_indicator(minor_indicators[0])
         elif patch_indicators:
-            return "patch", patch_indicators[0]
+            return "patch", format_indicator(patch_indicators[0])
         else:
             return "patch", "Default patch bump for changes"
             
@@ -390,37 +496,45 @@ def write_github_outputs(data):
     """Write outputs for GitHub Actions"""
     github_output = os.environ.get('GITHUB_OUTPUT')
     if github_output:
+        payload = ''.join(f"{key}={value}\n" for key, value in data.items())
         with open(github_output, 'a') as f:
-            for key, value in data.items():
-                f.write(f"{key}={value}\n")
+            f.write(payload)
+
+
+_BUMP_EMOJI = {
+    "major": "🚨", "minor": "✨", "patch": "🐛",
+    "graduate": "🎓", "alpha": "🔢", "beta": "🔢", "rc": "🔢",
+    "promote-beta": "📈", "promote-rc": "📈"
+}
+_BUMP_DESC = {
+    "major": "Breaking changes", "minor": "New features", "patch": "Bug fixes",
+    "graduate": "Alpha graduation", "alpha": "Alpha increment", "beta": "Beta increment",
+    "rc": "Release candidate increment", "promote-beta": "Promote to beta", "promote-rc": "Promote to release candidate"
+}
 
 
 def create_version_summary(current_version, new_version, bump_type, reason):
     """Create detailed summary for GitHub Actions"""
-    bump_emoji = {
-        "major": "🚨", "minor": "✨", "patch": "🐛", 
-        "graduate": "🎓", "alpha": "🔢", "beta": "🔢", "rc": "🔢",
-        "promote-beta": "📈", "promote-rc": "📈"
-    }
-    bump_desc = {
-        "major": "Breaking changes", "minor": "New features", "patch": "Bug fixes", 
-        "graduate": "Alpha graduation", "alpha": "Alpha increment", "beta": "Beta increment", 
-        "rc": "Release candidate increment", "promote-beta": "Promote to beta", "promote-rc": "Promote to release candidate"
-    }
+    summary = f"""## 🤖 Smart Auto-Version Update
+
+**{current_version}** → **{new_version}**
+
+**Type:** {bump_type.upper()} {_BUMP_EMOJI[bump_type]} - {_BUMP_DESC[bump_type]}
+
+### 🧠 AI Analysis
+**Decision Reason:** {reason}
+
+### Details
+- Previous version: `{current_version}`
+- New version: `{new_version}`
+- Bump type: {bump_type.upper()}
+- Analysis: Automatic based on code changes
+
+---
+*🚀 This version will be automatically tagged and released.*"""
     
     with open("version_summary.txt", "w") as f:
-        f.write(f"## 🤖 Smart Auto-Version Update\n\n")
-        f.write(f"**{current_version}** → **{new_version}**\n\n")
-        f.write(f"**Type:** {bump_type.upper()} {bump_emoji[bump_type]} - {bump_desc[bump_type]}\n\n")
-        f.write(f"### 🧠 AI Analysis\n")
-        f.write(f"**Decision Reason:** {reason}\n\n")
-        f.write(f"### Details\n")
-        f.write(f"- Previous version: `{current_version}`\n")
-        f.write(f"- New version: `{new_version}`\n")
-        f.write(f"- Bump type: {bump_type.upper()}\n")
-        f.write(f"- Analysis: Automatic based on code changes\n\n")
-        f.write(f"---\n")
-        f.write(f"*🚀 This version will be automatically tagged and released.*")
+        f.write(summary)
 
 
 def main():
@@ -429,11 +543,7 @@ def main():
     os.chdir('.')
     print(f"📂 Working directory: {os.getcwd()}")
     
-    # Get current version (file-based only for reliability)
-    current_version = get_version_from_file()
-    print(f"📦 Current version: {current_version}")
-    
-    # Check if this is a version bump commit from the bot
+    # Check if this is a version bump commit from the bot before doing any other work
     repo = git.Repo('.')
     last_commit = repo.head.commit
     if "🤖 Auto-bump version" in last_commit.message:
@@ -455,8 +565,12 @@ def main():
         })
         return
     
+    # Get current version (file-based only for reliability)
+    current_version, about_content = get_version_from_file()
+    print(f"📦 Current version: {current_version}")
+    
     # Analyze and determine bump type
-    bump_type, reason = analyze_changes()
+    bump_type, reason = analyze_changes(repo, last_commit)
     print(f"\n🎯 Decision: {bump_type.upper()} bump")
     print(f"📝 Reason: {reason}")
     
@@ -465,7 +579,7 @@ def main():
     print(f"\n⬆️  Calculated new version: {current_version} → {new_version}")
     
     # Update version file
-    if update_version_file(new_version):
+    if update_version_file(new_version, about_content):
         print(f"✅ Version bumped: {current_version} → {new_version}")
     else:
         print(f"❌ Failed to update version")
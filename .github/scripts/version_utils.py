@@ -0,0 +1,39 @@
+"""
+Shared helpers for the versioning scripts in this directory
+
+Used by: .github/scripts/analyze_version.py, .github/scripts/analyze_pr.py
+Purpose: Locate the __version__ string and parse `git diff --name-status -z` output
+Dependencies: None (operates on strings; callers run git themselves)
+"""
+
+
+def find_version_span(content):
+    """Return the (start, end) offsets of the quoted __version__ value, or None"""
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        if line.lstrip().startswith('__version__'):
+            _, sep, value = line.partition('=')
+            value = value.lstrip()
+            if sep and value[:1] in ('"', "'"):
+                start = offset + len(line) - len(value) + 1
+                end = content.find(value[0], start, offset + len(line))
+                # An empty value is treated like a missing one
+                if end > start:
+                    return start, end
+        offset += len(line)
+    return None
+
+
+def parse_name_status(output):
+    """List (status, path) from `git diff --name-status -z -M` output"""
+    fields = iter(output.split('\0'))
+    changes = []
+    for status in fields:
+        if not status:
+            continue
+        path = next(fields)
+        # Renames and copies are followed by the old and the new path
+        if status[0] in 'RC':
+            path = next(fields)
+        changes.append((status[0], path))
+    return changes
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The CI versioning scripts are run by path rather than installed, so make them importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / '.github' / 'scripts'))
@@ -0,0 +1,72 @@
+import subprocess
+
+import pytest
+
+from analyze_pr import analyze_pr_impact, get_changed_files, get_version_from_file
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+        cwd=cwd, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def pr_repo(tmp_path, monkeypatch):
+    """A PR branch forked from origin/main, with main moving on after the fork"""
+    about = tmp_path / 'backend' / 'global_economy_sim' / '__about__.py'
+    about.parent.mkdir(parents=True)
+    about.write_text('__version__ = "0.2.0b1"\n')
+    (tmp_path / 'core.py').write_text('a = 1\n')
+    (tmp_path / 'old.py').write_text('b = 2\n')
+    (tmp_path / 'README.md').write_text('# Project\n')
+    _git(tmp_path, 'init', '-q', '-b', 'main')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-qm', 'init')
+
+    _git(tmp_path, 'checkout', '-q', '-b', 'pr')
+    (tmp_path / 'core.py').write_text('a = 2\n')
+    (tmp_path / 'new_api.py').write_text('c = 3\n')
+    _git(tmp_path, 'mv', 'README.md', 'GUIDE.md')
+    _git(tmp_path, 'rm', '-q', 'old.py')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-qm', 'pr change')
+
+    # Work that lands on main after the fork must not count towards the PR
+    _git(tmp_path, 'checkout', '-q', 'main')
+    about.write_text('__version__ = "0.2.0b2"\n')
+    (tmp_path / 'main_only.py').write_text('d = 4\n')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-qm', 'main moves on')
+    _git(tmp_path, 'update-ref', 'refs/remotes/origin/main', 'main')
+    _git(tmp_path, 'checkout', '-q', 'pr')
+
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_get_version_from_file(pr_repo):
+    assert get_version_from_file('origin/main') == "0.2.0b2"
+    assert get_version_from_file('HEAD') == "0.2.0b1"
+    assert get_version_from_file('no-such-rev') == "0.1.0"
+
+
+def test_get_changed_files(pr_repo):
+    assert sorted(get_changed_files('origin/main', 'HEAD')) == [
+        ('A', 'new_api.py'),
+        ('D', 'old.py'),
+        ('M', 'core.py'),
+        ('R', 'GUIDE.md'),
+    ]
+
+
+def test_analyze_pr_impact(pr_repo):
+    assert analyze_pr_impact() == {
+        'base_version': "0.2.0b2",
+        'predicted_bump': "MAJOR 🚨",
+        'total_files': 4,
+        'python_files': 3,
+        'new_files': 1,
+        'deleted_files': 1,
+    }
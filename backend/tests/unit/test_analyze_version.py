@@ -0,0 +1,316 @@
+import subprocess
+
+import git
+import pytest
+
+import analyze_version
+from analyze_version import (
+    added_lines,
+    analyze_changes,
+    get_changed_files,
+    get_line_counts,
+    increment_version,
+    iter_patch_batches,
+    parse_version,
+)
+
+
+@pytest.mark.parametrize("version_string, expected", [
+    ("0.1.0", (0, 1, 0, None)),
+    ("0.0.0a0", (0, 0, 0, ('a', 0))),
+    ("0.1.1b12", (0, 1, 1, ('b', 12))),
+    ("2.10.3rc1", (2, 10, 3, ('rc', 1))),
+    # Shapes the fast regex rejects go through packaging
+    ("1.0", (1, 0, 0, None)),
+    ("0.1.0-alpha.1", (0, 1, 0, ('a', 1))),
+    ("0.1.0RC2", (0, 1, 0, ('rc', 2))),
+    ("0.1.0dev1", (0, 1, 0, ('dev', 1))),
+    ("0.1.0.dev1", (0, 1, 0, ('dev', 1))),
+    ("0.1.0.post1", (0, 1, 0, None)),
+])
+def test_parse_version(version_string, expected):
+    assert tuple(parse_version(version_string)) == expected
+
+
+def test_parse_version_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_version("not-a-version")
+
+
+# The "Complete Version Lifecycle Example" from VERSIONING.md, one step per row
+@pytest.mark.parametrize("current, bump_type, expected", [
+    ("0.0.0a0", "alpha", "0.0.0a1"),
+    ("0.0.0a1", "minor", "0.1.0a1"),
+    ("0.1.0a1", "alpha", "0.1.0a2"),
+    ("0.1.0a2", "patch", "0.1.1a2"),
+    ("0.1.1a2", "promote-beta", "0.1.1b0"),
+    ("0.1.1b0", "beta", "0.1.1b1"),
+    ("0.1.1b1", "minor", "0.2.0b1"),
+    ("0.2.0b1", "promote-rc", "0.2.0rc0"),
+    ("0.2.0rc0", "rc", "0.2.0rc1"),
+    ("0.2.0rc1", "graduate", "0.2.0"),
+    ("0.1.0a2", "major", "1.0.0a2"),
+    ("0.2.0", "patch", "0.2.1"),
+    ("0.2.0", "major", "1.0.0"),
+    ("0.2.0", "unknown-bump", "0.2.1"),
+])
+def test_increment_version_lifecycle(current, bump_type, expected):
+    assert increment_version(current, bump_type) == expected
+
+
+# Backward progressions and stage commands on the wrong stage leave the version alone
+@pytest.mark.parametrize("current, bump_type", [
+    ("0.1.0b2", "alpha"),
+    ("0.1.0rc1", "beta"),
+    ("0.1.0rc1", "promote-beta"),
+    ("0.1.0a3", "promote-rc"),
+    ("0.1.0b3", "promote-beta"),
+    ("0.1.0rc0", "promote-rc"),
+    ("0.1.0", "graduate"),
+    ("0.1.0", "alpha"),
+    ("0.1.0", "promote-beta"),
+])
+def test_increment_version_blocked(current, bump_type):
+    assert increment_version(current, bump_type) == current
+
+
+# "Unknown Pre-Release Type Handling" from VERSIONING.md
+@pytest.mark.parametrize("current, bump_type, expected", [
+    ("0.1.0dev1", "minor", "0.2.0dev1"),
+    ("0.1.0dev1", "major", "1.0.0dev1"),
+    ("0.1.0dev1", "graduate", "0.1.0"),
+    ("0.1.0.dev1", "graduate", "0.1.0"),
+    ("0.1.0dev1", "alpha", "0.1.0dev1"),
+    ("0.1.0dev1", "promote-beta", "0.1.0dev1"),
+    ("0.1.0dev1", "promote-rc", "0.1.0dev1"),
+])
+def test_increment_version_unknown_pre_release(current, bump_type, expected):
+    assert increment_version(current, bump_type) == expected
+
+
+def test_increment_version_unknown_pre_release_is_logged(capsys):
+    increment_version("0.1.0dev1", "minor")
+    out = capsys.readouterr().out
+    assert "Unknown pre-release type 'dev'" in out
+    assert "Preserving original pre-release identifier: dev1" in out
+
+
+def test_increment_version_invalid_returns_current():
+    assert increment_version("not-a-version", "minor") == "not-a-version"
+
+
+def test_added_lines_ignores_context_and_removed_lines():
+    patch = (
+        b"--- a/m.py\n"
+        b"+++ b/m.py\n"
+        b"@@ -1,3 +1,3 @@\n"
+        b" def f():\n"
+        b"-    # old path removed\n"
+        b"+    return 2\n"
+        b"++++ literal plus lines are not headers\n"
+    )
+    assert added_lines(patch) == b"    return 2\n+++ literal plus lines are not headers"
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+        cwd=cwd, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def repo_dir(tmp_path, monkeypatch):
+    """Repository with an alpha __about__.py and a few files committed; also the working directory"""
+    _git(tmp_path, 'init', '-q')
+    about = tmp_path / 'backend' / 'global_economy_sim' / '__about__.py'
+    about.parent.mkdir(parents=True)
+    about.write_text('__version__ = "0.1.0a1"\n')
+    (tmp_path / 'api').mkdir()
+    (tmp_path / 'api' / 'routes.py').write_text('ROUTES = []\n')
+    (tmp_path / 'util.py').write_text('def helper():\n    # legacy path removed upstream\n    return 1\n')
+    (tmp_path / 'old_name.py').write_text(''.join(f'line {i}\n' for i in range(20)))
+    (tmp_path / 'edited.py').write_text('a = 1\n')
+    (tmp_path / 'gone.py').write_text('b = 2\n')
+    (tmp_path / 'README.md').write_text('# Project\n')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-qm', 'init')
+
+    monkeypatch.chdir(tmp_path)
+    analyze_version.get_version_from_file.cache_clear()
+    yield tmp_path
+    analyze_version.get_version_from_file.cache_clear()
+
+
+def _commit_and_analyze(repo_dir, message):
+    _git(repo_dir, 'add', '-A')
+    _git(repo_dir, 'commit', '-q', '--allow-empty', '-m', message)
+    repo = git.Repo(repo_dir)
+    return analyze_changes(repo, repo.head.commit)
+
+
+@pytest.fixture
+def temp_repo(repo_dir):
+    """Second commit with a rename, two edits, an addition with a non-ASCII name and a deletion"""
+    _git(repo_dir, 'mv', 'old_name.py', 'new_name.py')
+    with open(repo_dir / 'new_name.py', 'a') as f:
+        f.write('line 20\n')
+    (repo_dir / 'edited.py').write_text('a = 2\nc = 3\n')
+    with open(repo_dir / 'util.py', 'a') as f:
+        f.write('HELPERS = [helper]\n')
+    (repo_dir / 'ekonomija čšž.py').write_text('x = 1\n')
+    _git(repo_dir, 'rm', '-q', 'gone.py')
+    _git(repo_dir, 'add', '.')
+    _git(repo_dir, 'commit', '-qm', 'change')
+
+    repo = git.Repo(repo_dir)
+    head = repo.head.commit
+    return repo, head.parents[0], head
+
+
+def test_get_changed_files(temp_repo):
+    repo, base, head = temp_repo
+    assert sorted(get_changed_files(repo, base, head)) == [
+        ('A', 'ekonomija čšž.py'),
+        ('D', 'gone.py'),
+        ('M', 'edited.py'),
+        ('M', 'util.py'),
+        ('R', 'new_name.py'),
+    ]
+
+
+def test_get_line_counts(temp_repo):
+    repo, base, head = temp_repo
+    assert get_line_counts(repo, base, head) == {
+        'edited.py': (2, 1),
+        'ekonomija čšž.py': (1, 0),
+        'gone.py': (0, 1),
+        'util.py': (1, 0),
+        # A rename is recorded under both its old and its new path
+        'old_name.py': (1, 0),
+        'new_name.py': (1, 0),
+    }
+
+
+def test_analyze_changes_initial_commit(tmp_path, monkeypatch):
+    (tmp_path / 'a.py').write_text('a = 1\n')
+    _git(tmp_path, 'init', '-q')
+    monkeypatch.chdir(tmp_path)
+    assert _commit_and_analyze(tmp_path, 'init') == ("patch", "Initial commit")
+
+
+def test_analyze_changes_added_file(repo_dir):
+    (repo_dir / 'extra.py').write_text('x = 1\n')
+    assert _commit_and_analyze(repo_dir, 'tweak') == ("minor", "New file: extra.py")
+
+
+def test_analyze_changes_added_api_file(repo_dir):
+    (repo_dir / 'api' / 'client.py').write_text('x = 1\n')
+    assert _commit_and_analyze(repo_dir, 'tweak') == ("minor", "New API/interface: api/client.py")
+
+
+def test_analyze_changes_deleted_file(repo_dir):
+    (repo_dir / 'gone.py').unlink()
+    assert _commit_and_analyze(repo_dir, 'tweak') == ("major", "Deleted core file: gone.py")
+
+
+def test_analyze_changes_small_fix_ignores_context_lines(repo_dir):
+    # The unchanged 'def helper():' and '... removed ...' lines are only hunk context
+    (repo_dir / 'util.py').write_text('def helper():\n    # legacy path removed upstream\n    return 2\n')
+    assert _commit_and_analyze(repo_dir, 'tweak') == ("patch", "Small fix: util.py (2 changes)")
+
+
+def test_analyze_changes_ignores_keywords_on_removed_lines(repo_dir):
+    (repo_dir / 'util.py').write_text('def helper():\n    return 1\n')
+    assert _commit_and_analyze(repo_dir, 'tweak') == ("patch", "Small fix: util.py (1 changes)")
+
+
+def test_analyze_changes_added_def(repo_dir):
+    with open(repo_dir / 'util.py', 'a') as f:
+        f.write('\n\ndef other():\n    return 2\n')
+    assert _commit_and_analyze(repo_dir, 'tweak') == ("minor", "New functionality in util.py")
+
+
+def test_analyze_changes_added_deprecation(repo_dir):
+    with open(repo_dir / 'util.py', 'a') as f:
+        f.write('# helper is deprecated, call other() instead\n')
+    assert _commit_and_analyze(repo_dir, 'tweak') == ("major", "Breaking change detected in util.py")
+
+
+def test_analyze_changes_large_core_refactor(repo_dir):
+    with open(repo_dir / 'api' / 'routes.py', 'a') as f:
+        f.write(''.join(f'ROUTES.append({i})\n' for i in range(120)))
+    assert _commit_and_analyze(repo_dir, 'tweak') == (
+        "major", "Major refactoring in core file: api/routes.py (120 changes)"
+    )
+
+
+def test_analyze_changes_stops_at_first_major(repo_dir, capsys):
+    (repo_dir / 'gone.py').unlink()
+    with open(repo_dir / 'util.py', 'a') as f:
+        f.write('# helper is deprecated\n')
+    assert _commit_and_analyze(repo_dir, 'tweak') == ("major", "Deleted core file: gone.py")
+    assert "Analyzing: util.py" not in capsys.readouterr().out
+
+
+def test_iter_patch_batches(temp_repo):
+    repo, base, head = temp_repo
+    batches = list(iter_patch_batches(base, head, ['edited.py', 'util.py'], batch_size=1))
+    assert batches == [{'edited.py': b'a = 2\nc = 3'}, {'util.py': b'HELPERS = [helper]'}]
+
+
+@pytest.mark.parametrize("message, bump_type, reason", [
+    ("Added export docs", "minor", "Feature indicated in commit: Added export docs"),
+    ("New features for the docs", "minor", "Feature indicated in commit: New features"),
+    ("This breaks the old docs", "major", "Breaking change indicated in commit: This breaks"),
+])
+def test_analyze_changes_commit_keywords(repo_dir, message, bump_type, reason):
+    with open(repo_dir / 'README.md', 'a') as f:
+        f.write('More docs.\n')
+    result = _commit_and_analyze(repo_dir, message)
+    assert result[0] == bump_type
+    assert result[1].startswith(reason)
+
+
+@pytest.mark.parametrize("message", ["Fixed typo", "fixes #12", "Patched the bugs"])
+def test_analyze_changes_fix_keywords(repo_dir, message, capsys):
+    with open(repo_dir / 'README.md', 'a') as f:
+        f.write('More docs.\n')
+    _commit_and_analyze(repo_dir, message)
+    assert "Patch indicators: 2\n" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("message", ["Tweak prefix handling", "Update address book"])
+def test_analyze_changes_ignores_embedded_keywords(repo_dir, message):
+    with open(repo_dir / 'README.md', 'a') as f:
+        f.write('More docs.\n')
+    assert _commit_and_analyze(repo_dir, message) == ("patch", "Documentation updated: README.md")
+
+
+@pytest.mark.parametrize("message, bump_type", [
+    ("[graduate to stable] ship it", "graduate"),
+    ("[Bump Alpha] small tweak", "alpha"),
+    ("[beta increment]", "beta"),
+    ("[release candidate increment]", "rc"),
+    ("[alpha to beta] wider testing", "promote-beta"),
+    ("[promote to rc]", "promote-rc"),
+])
+def test_analyze_changes_stage_commands(repo_dir, message, bump_type):
+    (repo_dir / 'gone.py').unlink()
+    assert _commit_and_analyze(repo_dir, message)[0] == bump_type
+
+
+def test_analyze_changes_unknown_pre_release(repo_dir):
+    (repo_dir / 'backend' / 'global_economy_sim' / '__about__.py').write_text('__version__ = "0.1.0dev1"\n')
+    assert _commit_and_analyze(repo_dir, '[graduate from alpha]')[0] == "graduate"
+    analyze_version.get_version_from_file.cache_clear()
+    (repo_dir / 'extra.py').write_text('x = 1\n')
+    assert _commit_and_analyze(repo_dir, 'tweak') == ("minor", "New file: extra.py")
+
+
+def test_analyze_changes_skips_feature_scan_after_minor(repo_dir, capsys):
+    (repo_dir / 'extra.py').write_text('x = 1\n')
+    with open(repo_dir / 'util.py', 'a') as f:
+        f.write('\n\ndef other():\n    return 2\n')
+    assert _commit_and_analyze(repo_dir, 'tweak') == ("minor", "New file: extra.py")
+    assert "Minor indicators: 1\n" in capsys.readouterr().out
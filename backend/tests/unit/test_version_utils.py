@@ -0,0 +1,58 @@
+import pytest
+
+from version_utils import find_version_span, parse_name_status
+
+
+def _version(content):
+    span = find_version_span(content)
+    return content[span[0]:span[1]] if span else None
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('__version__ = "0.1.0a1"\n', "0.1.0a1"),
+    ("__version__ = '0.1.0a1'\n", "0.1.0a1"),
+    ('__version__="1.2.3"', "1.2.3"),
+    ('__version__: str = "0.2.0rc1"\n', "0.2.0rc1"),
+    ('"""About."""\n\n__author__ = "x"\n__version__ = "0.1.0dev1"  # bumped by CI\n', "0.1.0dev1"),
+])
+def test_find_version_span(content, expected):
+    assert _version(content) == expected
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    '__author__ = "x"\n',
+    "__version__ = get_version()\n",
+    '__version__ = ""\n',
+    '__version__ = "unterminated\n',
+])
+def test_find_version_span_without_version(content):
+    assert find_version_span(content) is None
+
+
+def test_find_version_span_splices_in_place():
+    content = '__author__ = "x"\n__version__ = "0.1.0"\n__license__ = "MIT"\n'
+    start, end = find_version_span(content)
+    assert content[:start] + "0.2.0" + content[end:] == (
+        '__author__ = "x"\n__version__ = "0.2.0"\n__license__ = "MIT"\n'
+    )
+
+
+def test_parse_name_status():
+    output = "M\0src/a.py\0A\0src/new.py\0D\0old.py\0R087\0src/b.py\0src/c.py\0C100\0x.py\0y.py\0"
+    assert parse_name_status(output) == [
+        ("M", "src/a.py"),
+        ("A", "src/new.py"),
+        ("D", "old.py"),
+        ("R", "src/c.py"),
+        ("C", "y.py"),
+    ]
+
+
+def test_parse_name_status_keeps_unusual_paths_verbatim():
+    output = "A\0docs/ekonomija čšž.md\0M\0tab\there.py\0"
+    assert parse_name_status(output) == [("A", "docs/ekonomija čšž.md"), ("M", "tab\there.py")]
+
+
+def test_parse_name_status_empty():
+    assert parse_name_status("") == []